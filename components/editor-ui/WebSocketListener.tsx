@@ -37,9 +37,6 @@ const WebSocketListener = ({
     onNavigationControl
   });
 
-  // Add heartbeat ref
-  const heartbeatRef = useRef<NodeJS.Timeout | null>(null);
-
   // Update refs when callbacks change
   useEffect(() => {
     callbacksRef.current = {
@@ -82,29 +79,12 @@ const WebSocketListener = ({
       console.log(`🔌 [WebSocket] Successfully connected to MCP server at ${serverUrl}`);
       console.log(`🔌 [WebSocket] Socket ID: ${newSocket.id}`);
       console.log(`🔌 [WebSocket] Transport: ${newSocket.io.engine.transport.name}`);
-
-      // Start heartbeat to keep connection alive
-      if (heartbeatRef.current) {
-        clearInterval(heartbeatRef.current);
-      }
-      heartbeatRef.current = setInterval(() => {
-        if (newSocket.connected) {
-          console.log('💓 [WebSocket] Sending heartbeat ping...');
-          newSocket.emit('ping', { timestamp: Date.now() });
-        }
-      }, 15000); // Send ping every 15 seconds
     });
 
     newSocket.on('disconnect', (reason) => {
       setConnected(false);
       console.log(`🔌 [WebSocket] Disconnected from MCP server. Reason: ${reason}`);
 
-      // Clear heartbeat on disconnect
-      if (heartbeatRef.current) {
-        clearInterval(heartbeatRef.current);
-        heartbeatRef.current = null;
-      }
-
       // Don't immediately try to reconnect for certain reasons
       if (reason === 'io client disconnect' || reason === 'transport close') {
         console.log(`🔌 [WebSocket] Clean disconnect, not attempting reconnection`);
@@ -212,11 +192,6 @@ const WebSocketListener = ({
       callbacksRef.current.onNavigationControl?.('dashboard');
     });
 
-    // Handle pong response from server
-    newSocket.on('pong', (data) => {
-      console.log('💓 [WebSocket] Received pong from server:', data);
-    });
-
     // Log all incoming events for debugging
     newSocket.onAny((eventName, ...args) => {
       console.log(`📨 [MCP] WebSocket event: ${eventName}`, args);
@@ -226,12 +201,6 @@ const WebSocketListener = ({
     return () => {
       console.log('🔌 [WebSocket] Cleaning up connection...');
 
-      // Clear heartbeat
-      if (heartbeatRef.current) {
-        clearInterval(heartbeatRef.current);
-        heartbeatRef.current = null;
-      }
-
       // Only disconnect if the socket is actually connected
       if (newSocket.connected) {
         console.log('🔌 [WebSocket] Socket is connected, performing clean disconnect...');
@@ -8,6 +8,7 @@ import { io, Socket } from "socket.io-client";
 // WebSocket connection to p5.js editor
 let editorSocket: Socket | null = null;
 let isConnectedToEditor = false;
+let lastConnectionAttempt = "never";
 
 // Configuration
 const EDITOR_WEBSOCKET_URL = "http://localhost:3001";
@@ -22,6 +23,7 @@ const server = new McpServer({
 // WebSocket connection management
 function connectToEditor() {
   console.error("🔌 Attempting to connect to p5.js editor...");
+  lastConnectionAttempt = new Date().toISOString();
 
   editorSocket = io(EDITOR_WEBSOCKET_URL, {
     transports: ['websocket'],
@@ -31,6 +33,10 @@ function connectToEditor() {
     reconnectionAttempts: 5
   });
 
+  editorSocket.io.on('reconnect_attempt', () => {
+    lastConnectionAttempt = new Date().toISOString();
+  });
+
   editorSocket.on('connect', () => {
     console.error("✅ Connected to p5.js editor");
     isConnectedToEditor = true;
@@ -53,32 +59,42 @@ function connectToEditor() {
   return editorSocket;
 }
 
+// Shared results: socket.io-client's emit() buffers the packet and returns
+// immediately, so tools only wait for the connection check
+const NOT_CONNECTED = Promise.resolve(false);
+const QUEUED = Promise.resolve(true);
+
 // Helper function to send WebSocket message
-function sendToEditor(event: string, data?: any): Promise<boolean> {
-  return new Promise((resolve) => {
-    if (!editorSocket || !isConnectedToEditor) {
-      console.error("⚠️ Not connected to editor");
-      resolve(false);
-      return;
-    }
+function sendToEditor(event: string, ...args: any[]): Promise<boolean> {
+  if (!editorSocket || !isConnectedToEditor) {
+    console.error("⚠️ Not connected to editor");
+    return NOT_CONNECTED;
+  }
 
-    try {
-      if (data) {
-        editorSocket.emit(event, data);
-      } else {
-        editorSocket.emit(event);
-      }
-      console.error(`📤 Sent ${event} to editor`);
-      resolve(true);
-    } catch (error) {
-      console.error(`❌ Error sending ${event}:`, error);
-      resolve(false);
-    }
-  });
+  editorSocket.emit(event, ...args);
+  console.error(`📤 Sent ${event} to editor`);
+  return QUEUED;
 }
 
 // MCP Tools
 
+// Registers a tool that forwards a single argument-less command to the editor
+function registerEditorCommand(name: string, event: string, successText: string, failureText: string) {
+  server.tool(
+    name,
+    {},
+    async () => {
+      const success = await sendToEditor(event);
+      return {
+        content: [{
+          type: "text",
+          text: success ? successText : failureText
+        }]
+      };
+    }
+  );
+}
+
 // 1. Code Update Tool
 server.tool(
   "update_code",
@@ -109,61 +125,33 @@ server.tool(
 );
 
 // 2. Execution Control Tools
-server.tool(
+registerEditorCommand(
   "start_execution",
-  {},
-  async () => {
-    const success = await sendToEditor('startExecution');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "▶️ Started code execution" : "❌ Failed to start execution"
-      }]
-    };
-  }
+  'startExecution',
+  "▶️ Started code execution",
+  "❌ Failed to start execution"
 );
 
-server.tool(
+registerEditorCommand(
   "stop_execution",
-  {},
-  async () => {
-    const success = await sendToEditor('stopExecution');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "⏹️ Stopped code execution" : "❌ Failed to stop execution"
-      }]
-    };
-  }
+  'stopExecution',
+  "⏹️ Stopped code execution",
+  "❌ Failed to stop execution"
 );
 
-server.tool(
+registerEditorCommand(
   "toggle_execution",
-  {},
-  async () => {
-    const success = await sendToEditor('toggleExecution');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "🔄 Toggled code execution" : "❌ Failed to toggle execution"
-      }]
-    };
-  }
+  'toggleExecution',
+  "🔄 Toggled code execution",
+  "❌ Failed to toggle execution"
 );
 
 // 3. Console Control Tools
-server.tool(
+registerEditorCommand(
   "clear_console",
-  {},
-  async () => {
-    const success = await sendToEditor('clearConsole');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "🧹 Console cleared" : "❌ Failed to clear console"
-      }]
-    };
-  }
+  'clearConsole',
+  "🧹 Console cleared",
+  "❌ Failed to clear console"
 );
 
 server.tool(
@@ -239,18 +227,11 @@ server.tool(
 );
 
 // 5. Layout Control Tools
-server.tool(
+registerEditorCommand(
   "toggle_sidebar",
-  {},
-  async () => {
-    const success = await sendToEditor('toggleSidebar');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "📋 Toggled sidebar" : "❌ Failed to toggle sidebar"
-      }]
-    };
-  }
+  'toggleSidebar',
+  "📋 Toggled sidebar",
+  "❌ Failed to toggle sidebar"
 );
 
 server.tool(
@@ -270,20 +251,17 @@ server.tool(
 );
 
 // 6. Navigation Tools
-server.tool(
+registerEditorCommand(
   "go_to_dashboard",
-  {},
-  async () => {
-    const success = await sendToEditor('backToDashboard');
-    return {
-      content: [{
-        type: "text",
-        text: success ? "🏠 Navigated to dashboard" : "❌ Failed to navigate to dashboard"
-      }]
-    };
-  }
+  'backToDashboard',
+  "🏠 Navigated to dashboard",
+  "❌ Failed to navigate to dashboard"
 );
 
+// Only the connected flag changes, so both replies are built once
+const CONNECTED_STATUS_TEXT = `🔌 Connection Status:\n- Editor WebSocket: ✅ Connected\n- WebSocket URL: ${EDITOR_WEBSOCKET_URL}`;
+const DISCONNECTED_STATUS_TEXT = `🔌 Connection Status:\n- Editor WebSocket: ❌ Disconnected\n- WebSocket URL: ${EDITOR_WEBSOCKET_URL}`;
+
 // 7. Connection Status Tool
 server.tool(
   "check_connection",
@@ -292,7 +270,7 @@ server.tool(
     return {
       content: [{
         type: "text",
-        text: `🔌 Connection Status:\n- Editor WebSocket: ${isConnectedToEditor ? '✅ Connected' : '❌ Disconnected'}\n- WebSocket URL: ${EDITOR_WEBSOCKET_URL}`
+        text: isConnectedToEditor ? CONNECTED_STATUS_TEXT : DISCONNECTED_STATUS_TEXT
       }]
     };
   }
@@ -300,20 +278,8 @@ server.tool(
 
 // Resources
 
-// Project state resource
-server.resource(
-  "project-state",
-  "p5js://project/current",
-  async () => {
-    return {
-      contents: [{
-        uri: "p5js://project/current",
-        text: `Current p5.js Editor Connection Status:
-- WebSocket Connected: ${isConnectedToEditor}
-- WebSocket URL: ${EDITOR_WEBSOCKET_URL}
-- Last Connection Attempt: ${new Date().toISOString()}
-
-Available Tools:
+// Everything after the live connection details is static
+const PROJECT_STATE_HELP_TEXT = `Available Tools:
 - update_code: Update the code in the editor
 - start_execution/stop_execution/toggle_execution: Control code execution
 - clear_console/add_console_message: Manage console output
@@ -326,7 +292,22 @@ Available Tools:
 To use these tools, make sure:
 1. The p5.js editor is running at http://localhost:3000
 2. MCP is enabled in the editor (Enable MCP button)
-3. The WebSocket server is accessible at ${EDITOR_WEBSOCKET_URL}`
+3. The WebSocket server is accessible at ${EDITOR_WEBSOCKET_URL}`;
+
+// Project state resource
+server.resource(
+  "project-state",
+  "p5js://project/current",
+  async () => {
+    return {
+      contents: [{
+        uri: "p5js://project/current",
+        text: `Current p5.js Editor Connection Status:
+- WebSocket Connected: ${isConnectedToEditor}
+- WebSocket URL: ${EDITOR_WEBSOCKET_URL}
+- Last Connection Attempt: ${lastConnectionAttempt}
+
+${PROJECT_STATE_HELP_TEXT}`
       }]
     };
   }
@@ -413,21 +394,16 @@ async function main() {
 }
 
 // Handle process termination
-process.on('SIGINT', () => {
+function shutdown() {
   console.error("👋 Shutting down p5.js MCP Server...");
   if (editorSocket) {
     editorSocket.disconnect();
   }
   process.exit(0);
-});
+}
 
-process.on('SIGTERM', () => {
-  console.error("👋 Shutting down p5.js MCP Server...");
-  if (editorSocket) {
-    editorSocket.disconnect();
-  }
-  process.exit(0);
-});
+process.on('SIGINT', shutdown);
+process.on('SIGTERM', shutdown);
 
 // Start the server
 main().catch((error) => {
@@ -1,3 +1,4 @@
+const { createServer } = require('http');
 const { Server } = require('socket.io');
 const readline = require('readline');
 
@@ -15,10 +16,23 @@ function startServer() {
     }
 
     const port = tryPorts[portIndex];
+    const httpServer = createServer();
 
-    try {
+    // Listen errors are reported asynchronously, so a busy port is
+    // detected here rather than by a try/catch around listen()
+    httpServer.once('error', (error) => {
+      if (error.code === 'EADDRINUSE') {
+        console.log(`⚠️  Port ${port} is in use, trying next port...`);
+        tryPort(portIndex + 1);
+      } else {
+        console.error('❌ Server error:', error);
+        process.exit(1);
+      }
+    });
+
+    httpServer.listen(port, () => {
       // Create Socket.IO server
-      io = new Server(port, {
+      io = new Server(httpServer, {
         cors: {
           origin: "http://localhost:3000", // Next.js dev server
           methods: ["GET", "POST"]
@@ -35,16 +49,7 @@ function startServer() {
 
       // Set up the server event handlers
       setupServerHandlers();
-
-    } catch (error) {
-      if (error.code === 'EADDRINUSE') {
-        console.log(`⚠️  Port ${port} is in use, trying next port...`);
-        tryPort(portIndex + 1);
-      } else {
-        console.error('❌ Server error:', error);
-        process.exit(1);
-      }
-    }
+    });
   }
 
   tryPort();
@@ -55,11 +60,9 @@ function setupServerHandlers() {
   // Handle client connections
   io.on('connection', (socket) => {
     console.log(`✅ Client connected: ${socket.id}`);
-    clients.add(socket);
 
     socket.on('disconnect', () => {
       console.log(`❌ Client disconnected: ${socket.id}`);
-      clients.delete(socket);
     });
 
     // Listen for any messages from client (optional)
@@ -84,8 +87,10 @@ function setupServerHandlers() {
   });
 }
 
-// Store connected clients globally
-const clients = new Set();
+// Connected sockets are tracked by socket.io's default namespace
+function getConnectedCount() {
+  return io ? io.sockets.sockets.size : 0;
+}
 
 // Create readline interface for interactive testing
 const rl = readline.createInterface({
@@ -197,61 +202,72 @@ function draw() {
 }`
 };
 
+// Sample names listed in status output, computed once
+const SAMPLE_NAMES = Object.keys(sampleCodes).join(', ');
+
+// Menu text is built once; showMenu writes it in a single call
+const MENU_TEXT = `
+🎮 Test Commands:
+📝 Code Commands:
+  1-6: Send predefined code samples
+  custom: Enter custom code
+
+▶️ Execution Commands:
+  start: Start code execution
+  stop: Stop code execution
+  toggle: Toggle execution state
+
+📱 Console Commands:
+  clearconsole: Clear console messages
+  consolemsg: Add test console message
+  consoleheight: Set console height (200px)
+
+📂 File Commands:
+  selectfile: Select sketch.js file
+  closetab: Close current tab
+  createfile: Create new test file
+  deletefile: Delete test file
+
+🎛️ Layout Commands:
+  sidebar: Toggle sidebar
+  projectname: Update project name
+
+🧭 Navigation Commands:
+  dashboard: Go to dashboard
+
+ℹ️ System Commands:
+  status: Show connection status
+  clear: Clear terminal console
+  exit: Quit server
+
+Enter command: 
+`;
+
 function showMenu() {
-  console.log('\n🎮 Test Commands:');
-  console.log('📝 Code Commands:');
-  console.log('  1-6: Send predefined code samples');
-  console.log('  custom: Enter custom code');
-  console.log('');
-  console.log('▶️ Execution Commands:');
-  console.log('  start: Start code execution');
-  console.log('  stop: Stop code execution');
-  console.log('  toggle: Toggle execution state');
-  console.log('');
-  console.log('📱 Console Commands:');
-  console.log('  clearconsole: Clear console messages');
-  console.log('  consolemsg: Add test console message');
-  console.log('  consoleheight: Set console height (200px)');
-  console.log('');
-  console.log('📂 File Commands:');
-  console.log('  selectfile: Select sketch.js file');
-  console.log('  closetab: Close current tab');
-  console.log('  createfile: Create new test file');
-  console.log('  deletefile: Delete test file');
-  console.log('');
-  console.log('🎛️ Layout Commands:');
-  console.log('  sidebar: Toggle sidebar');
-  console.log('  projectname: Update project name');
-  console.log('');
-  console.log('🧭 Navigation Commands:');
-  console.log('  dashboard: Go to dashboard');
-  console.log('');
-  console.log('ℹ️ System Commands:');
-  console.log('  status: Show connection status');
-  console.log('  clear: Clear terminal console');
-  console.log('  exit: Quit server');
-  console.log('\nEnter command: ');
+  process.stdout.write(MENU_TEXT);
 }
 
 function sendCodeUpdate(code) {
-  if (clients.size === 0) {
+  const clientCount = getConnectedCount();
+  if (clientCount === 0) {
     console.log('⚠️  No clients connected. Start the p5.js editor and enable MCP first.');
     return;
   }
 
-  console.log(`📤 Sending code update to ${clients.size} client(s)...`);
+  console.log(`📤 Sending code update to ${clientCount} client(s)...`);
   io.emit('codeUpdate', { code });
   console.log('✅ Code update sent!\n');
 }
 
 function sendUICommand(event, data = null, description = '') {
-  if (clients.size === 0) {
+  const clientCount = getConnectedCount();
+  if (clientCount === 0) {
     console.log('⚠️  No clients connected. Start the p5.js editor and enable MCP first.');
     return;
   }
 
-  console.log(`📤 Sending ${description} to ${clients.size} client(s)...`);
-  if (data) {
+  console.log(`📤 Sending ${description} to ${clientCount} client(s)...`);
+  if (data !== null) {
     io.emit(event, data);
   } else {
     io.emit(event);
@@ -260,129 +276,96 @@ function sendUICommand(event, data = null, description = '') {
 }
 
 function showStatus() {
-  console.log(`\n📊 Server Status:`);
-  console.log(`   Connected clients: ${clients.size}`);
-  console.log(`   Server port: ${currentPort}`);
-  console.log(`   CORS origin: http://localhost:3000`);
-  console.log(`   Available samples: 1-6`);
-  console.log(`   UI Control Commands: 15+ available\n`);
+  console.log(`
+📊 Server Status:
+   Connected clients: ${getConnectedCount()}
+   Server port: ${currentPort}
+   CORS origin: http://localhost:3000
+   Available samples: ${SAMPLE_NAMES}
+   UI Control Commands: 15+ available
+`);
 }
 
+// Command handlers, looked up by name
+const commandHandlers = {
+  // Code sample commands
+  ...Object.fromEntries(
+    Object.keys(sampleCodes).map((key) => [key, () => sendCodeUpdate(sampleCodes[key])])
+  ),
+
+  // Execution control commands
+  start: () => sendUICommand('startExecution', null, 'start execution command'),
+  stop: () => sendUICommand('stopExecution', null, 'stop execution command'),
+  toggle: () => sendUICommand('toggleExecution', null, 'toggle execution command'),
+
+  // Console control commands
+  clearconsole: () => sendUICommand('clearConsole', null, 'clear console command'),
+  consolemsg: () => sendUICommand('addConsoleMessage', {
+    type: 'info',
+    message: 'Test message from WebSocket server',
+    timestamp: Date.now()
+  }, 'add console message command'),
+  consoleheight: () => sendUICommand('setConsoleHeight', 200, 'set console height command'),
+
+  // File/tab control commands
+  selectfile: () => sendUICommand('selectFile', 'sketch.js', 'select file command'),
+  closetab: () => sendUICommand('closeTab', 'sketch.js', 'close tab command'),
+  createfile: () => sendUICommand('createFile', {
+    name: 'test.js',
+    content: '// New file created via WebSocket\nconsole.log("Hello from WebSocket!");'
+  }, 'create file command'),
+  deletefile: () => sendUICommand('deleteFile', 'test.js', 'delete file command'),
+
+  // Layout control commands
+  sidebar: () => sendUICommand('toggleSidebar', null, 'toggle sidebar command'),
+  projectname: () => sendUICommand('updateProjectName', 'WebSocket Project', 'update project name command'),
+
+  // Navigation commands
+  dashboard: () => sendUICommand('backToDashboard', null, 'navigate to dashboard command'),
+
+  // System commands
+  status: showStatus,
+  clear: () => {
+    console.clear();
+    console.log(`🚀 Test WebSocket Server running on port ${currentPort}\n`);
+  },
+  exit: () => {
+    console.log('👋 Shutting down server...');
+    process.exit(0);
+  }
+};
+
+// Custom code being entered, or null when reading commands. Lines are
+// collected from the same readline interface as commands.
+let customCode = null;
+
 // Handle user input
 function handleInput(input) {
+  if (customCode !== null) {
+    if (input.trim() === 'END') {
+      const code = customCode;
+      customCode = null;
+      sendCodeUpdate(code);
+      showMenu();
+    } else {
+      customCode += input + '\n';
+    }
+    return;
+  }
+
   const command = input.trim();
 
-  switch (command) {
-    // Code sample commands
-    case '1':
-    case '2':
-    case '3':
-    case '4':
-    case '5':
-    case '6':
-      sendCodeUpdate(sampleCodes[command]);
-      break;
-
-    case 'custom':
-      console.log('\n📝 Enter your custom p5.js code (type "END" on a new line to finish):');
-      let customCode = '';
-
-      const customInput = readline.createInterface({
-        input: process.stdin,
-        output: process.stdout
-      });
+  if (command === 'custom') {
+    console.log('\n📝 Enter your custom p5.js code (type "END" on a new line to finish):');
+    customCode = '';
+    return; // Don't show menu immediately
+  }
 
-      customInput.on('line', (line) => {
-        if (line.trim() === 'END') {
-          customInput.close();
-          sendCodeUpdate(customCode);
-          showMenu();
-        } else {
-          customCode += line + '\n';
-        }
-      });
-      return; // Don't show menu immediately
-
-    // Execution control commands
-    case 'start':
-      sendUICommand('startExecution', null, 'start execution command');
-      break;
-
-    case 'stop':
-      sendUICommand('stopExecution', null, 'stop execution command');
-      break;
-
-    case 'toggle':
-      sendUICommand('toggleExecution', null, 'toggle execution command');
-      break;
-
-    // Console control commands
-    case 'clearconsole':
-      sendUICommand('clearConsole', null, 'clear console command');
-      break;
-
-    case 'consolemsg':
-      sendUICommand('addConsoleMessage', {
-        type: 'info',
-        message: 'Test message from WebSocket server',
-        timestamp: Date.now()
-      }, 'add console message command');
-      break;
-
-    case 'consoleheight':
-      sendUICommand('setConsoleHeight', 200, 'set console height command');
-      break;
-
-    // File/tab control commands
-    case 'selectfile':
-      sendUICommand('selectFile', 'sketch.js', 'select file command');
-      break;
-
-    case 'closetab':
-      sendUICommand('closeTab', 'sketch.js', 'close tab command');
-      break;
-
-    case 'createfile':
-      sendUICommand('createFile', {
-        name: 'test.js',
-        content: '// New file created via WebSocket\nconsole.log("Hello from WebSocket!");'
-      }, 'create file command');
-      break;
-
-    case 'deletefile':
-      sendUICommand('deleteFile', 'test.js', 'delete file command');
-      break;
-
-    // Layout control commands
-    case 'sidebar':
-      sendUICommand('toggleSidebar', null, 'toggle sidebar command');
-      break;
-
-    case 'projectname':
-      sendUICommand('updateProjectName', 'WebSocket Project', 'update project name command');
-      break;
-
-    // Navigation commands
-    case 'dashboard':
-      sendUICommand('backToDashboard', null, 'navigate to dashboard command');
-      break;
-
-    // System commands
-    case 'status':
-      showStatus();
-      break;
-
-    case 'clear':
-      console.clear();
-      console.log('🚀 Test WebSocket Server running on port 3001\n');
-      break;
-
-    case 'exit':
-      console.log('👋 Shutting down server...');
-      process.exit(0);
-
-    default:
-      console.log('❌ Unknown command. Type a valid command or see the menu above.');
+  // hasOwn keeps inherited names like 'toString' from matching
+  if (Object.hasOwn(commandHandlers, command)) {
+    commandHandlers[command]();
+  } else {
+    console.log('❌ Unknown command. Type a valid command or see the menu above.');
   }
 
   showMenu();
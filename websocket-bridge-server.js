@@ -1,12 +1,45 @@
+const { createServer } = require('http');
 const { Server } = require('socket.io');
+const { format } = require('util');
 
 // Try port 3001 first, then try alternatives
 const tryPorts = [3001, 3002, 3003, 3004];
 let currentPort = null;
 let io = null;
 
-// Store connected clients
-const clients = new Set();
+// Set BRIDGE_DEBUG=1 to log every forwarded event
+const DEBUG = process.env.BRIDGE_DEBUG === '1';
+
+// Connected sockets are tracked by socket.io's default namespace
+function getConnectedCount() {
+  return io ? io.sockets.sockets.size : 0;
+}
+
+// Log lines are queued and written to stdout in a single batch per
+// event loop turn, so forwarding an event doesn't cost a write per line
+let logQueue = [];
+let logFlushScheduled = false;
+
+function flushLog() {
+  logFlushScheduled = false;
+  if (logQueue.length === 0) return;
+  process.stdout.write(logQueue.join('\n') + '\n');
+  logQueue = [];
+}
+
+function queueLog(...args) {
+  logQueue.push(format(...args));
+  if (!logFlushScheduled) {
+    logFlushScheduled = true;
+    setImmediate(flushLog);
+  }
+}
+
+// Per-event forwarding logs are only written when DEBUG is enabled
+function debugLog(...args) {
+  if (!DEBUG) return;
+  queueLog(...args);
+}
 
 // Function to try starting server on different ports
 function startServer() {
@@ -17,14 +50,31 @@ function startServer() {
     }
 
     const port = tryPorts[portIndex];
+    const httpServer = createServer();
 
-    try {
+    // Listen errors are reported asynchronously, so a busy port is
+    // detected here rather than by a try/catch around listen()
+    httpServer.once('error', (error) => {
+      if (error.code === 'EADDRINUSE') {
+        console.log(`⚠️  Port ${port} is in use, trying next port...`);
+        tryPort(portIndex + 1);
+      } else {
+        console.error('❌ Server error:', error);
+        process.exit(1);
+      }
+    });
+
+    httpServer.listen(port, () => {
       // Create Socket.IO server
-      io = new Server(port, {
+      io = new Server(httpServer, {
         cors: {
           origin: "http://localhost:3000", // Next.js dev server
           methods: ["GET", "POST"]
-        }
+        },
+        // socket.io's defaults, restated on purpose: its built-in heartbeat
+        // is what detects dead clients, so the webapp runs no ping loop
+        pingInterval: 25000,
+        pingTimeout: 20000
       });
 
       currentPort = port;
@@ -37,16 +87,7 @@ function startServer() {
 
       // Set up the server event handlers
       setupServerHandlers();
-
-    } catch (error) {
-      if (error.code === 'EADDRINUSE') {
-        console.log(`⚠️  Port ${port} is in use, trying next port...`);
-        tryPort(portIndex + 1);
-      } else {
-        console.error('❌ Server error:', error);
-        process.exit(1);
-      }
-    }
+    });
   }
 
   tryPort();
@@ -56,18 +97,10 @@ function startServer() {
 function setupServerHandlers() {
   // Handle client connections
   io.on('connection', (socket) => {
-    console.log(`✅ Client connected: ${socket.id}`);
-    clients.add(socket);
+    queueLog(`✅ Client connected: ${socket.id}`);
 
     socket.on('disconnect', () => {
-      console.log(`❌ Client disconnected: ${socket.id}`);
-      clients.delete(socket);
-    });
-
-    // Listen for heartbeat pings
-    socket.on('ping', (data) => {
-      console.log(`💓 Heartbeat from ${socket.id}`);
-      socket.emit('pong', data);
+      queueLog(`❌ Client disconnected: ${socket.id}`);
     });
 
     // ===== MCP COMMAND FORWARDING =====
@@ -75,81 +108,84 @@ function setupServerHandlers() {
 
     // Code update from MCP server
     socket.on('codeUpdate', (data) => {
-      console.log('📝 [MCP→WebApp] Code update received, forwarding to webapp clients...');
-      console.log(`   Code preview: ${data.code ? data.code.substring(0, 100) + '...' : 'No code'}`);
+      // Skip building the code preview when nothing would be logged
+      if (DEBUG) {
+        queueLog('📝 [MCP→WebApp] Code update received, forwarding to webapp clients...');
+        queueLog(`   Code preview: ${data.code ? data.code.substring(0, 100) + '...' : 'No code'}`);
+      }
 
       // Forward to all OTHER clients (not the sender)
       socket.broadcast.emit('codeUpdate', data);
-      console.log(`   ✅ Forwarded to ${clients.size - 1} webapp client(s)`);
+      debugLog(`   ✅ Forwarded to ${getConnectedCount() - 1} webapp client(s)`);
     });
 
     // Execution control commands
     socket.on('startExecution', () => {
-      console.log('▶️ [MCP→WebApp] Start execution command, forwarding...');
+      debugLog('▶️ [MCP→WebApp] Start execution command, forwarding...');
       socket.broadcast.emit('startExecution');
     });
 
     socket.on('stopExecution', () => {
-      console.log('⏹️ [MCP→WebApp] Stop execution command, forwarding...');
+      debugLog('⏹️ [MCP→WebApp] Stop execution command, forwarding...');
       socket.broadcast.emit('stopExecution');
     });
 
     socket.on('toggleExecution', () => {
-      console.log('🔄 [MCP→WebApp] Toggle execution command, forwarding...');
+      debugLog('🔄 [MCP→WebApp] Toggle execution command, forwarding...');
       socket.broadcast.emit('toggleExecution');
     });
 
     // Console control commands
     socket.on('clearConsole', () => {
-      console.log('🧹 [MCP→WebApp] Clear console command, forwarding...');
+      debugLog('🧹 [MCP→WebApp] Clear console command, forwarding...');
       socket.broadcast.emit('clearConsole');
     });
 
     socket.on('addConsoleMessage', (data) => {
-      console.log('📱 [MCP→WebApp] Add console message command, forwarding...');
+      debugLog('📱 [MCP→WebApp] Add console message command, forwarding...');
       socket.broadcast.emit('addConsoleMessage', data);
     });
 
     socket.on('setConsoleHeight', (height) => {
-      console.log(`📏 [MCP→WebApp] Set console height (${height}px), forwarding...`);
+      debugLog(`📏 [MCP→WebApp] Set console height (${height}px), forwarding...`);
       socket.broadcast.emit('setConsoleHeight', height);
     });
 
     // File management commands
     socket.on('selectFile', (fileId) => {
-      console.log(`📂 [MCP→WebApp] Select file (${fileId}), forwarding...`);
+      debugLog(`📂 [MCP→WebApp] Select file (${fileId}), forwarding...`);
       socket.broadcast.emit('selectFile', fileId);
     });
 
     socket.on('closeTab', (fileId) => {
-      console.log(`❌ [MCP→WebApp] Close tab (${fileId}), forwarding...`);
+      debugLog(`❌ [MCP→WebApp] Close tab (${fileId}), forwarding...`);
       socket.broadcast.emit('closeTab', fileId);
     });
 
     socket.on('createFile', (fileData) => {
-      console.log(`📄 [MCP→WebApp] Create file (${fileData.name}), forwarding...`);
+      debugLog(`📄 [MCP→WebApp] Create file (${fileData.name}), forwarding...`);
       socket.broadcast.emit('createFile', fileData);
     });
 
     socket.on('deleteFile', (fileId) => {
-      console.log(`🗑️ [MCP→WebApp] Delete file (${fileId}), forwarding...`);
+      debugLog(`🗑️ [MCP→WebApp] Delete file (${fileId}), forwarding...`);
       socket.broadcast.emit('deleteFile', fileId);
     });
 
     // Layout control commands
     socket.on('toggleSidebar', () => {
-      console.log('📋 [MCP→WebApp] Toggle sidebar, forwarding...');
+      debugLog('📋 [MCP→WebApp] Toggle sidebar, forwarding...');
       socket.broadcast.emit('toggleSidebar');
     });
 
     socket.on('updateProjectName', (name) => {
-      console.log(`📝 [MCP→WebApp] Update project name (${name}), forwarding...`);
+      debugLog(`📝 [MCP→WebApp] Update project name (${name}), forwarding...`);
       socket.broadcast.emit('updateProjectName', name);
     });
 
     // Navigation commands
     socket.on('backToDashboard', () => {
-      console.log('🏠 [MCP→WebApp] Navigate to dashboard, forwarding...');
+      debugLog('🏠 [MCP→WebApp] Navigate to dashboard, forwarding...');
       socket.broadcast.emit('backToDashboard');
     });
 
@@ -157,54 +193,52 @@ function setupServerHandlers() {
     // These events come from the webapp and can be logged or forwarded to MCP server
 
     socket.on('projectState', (data) => {
-      console.log('📥 [WebApp→MCP] Received project state:', data.projectName, `(${data.files?.length || 0} files)`);
+      debugLog('📥 [WebApp→MCP] Received project state:', data.projectName, `(${data.files?.length || 0} files)`);
       // Could forward this to MCP server if needed
     });
 
     socket.on('getProjectState', () => {
-      console.log('📝 [WebApp→MCP] Client requesting project state...');
+      debugLog('📝 [WebApp→MCP] Client requesting project state...');
     });
 
-    // Catch-all for any other events
-    socket.onAny((eventName, ...args) => {
-      if (!['ping', 'pong'].includes(eventName)) {
-        console.log(`📨 [Unknown] Received event: ${eventName}`, args.length > 0 ? `(${args.length} args)` : '');
-      }
-    });
+    // Catch-all for any other events, only registered when it would log
+    if (DEBUG) {
+      socket.onAny((eventName, ...args) => {
+        queueLog(`📨 [Unknown] Received event: ${eventName}`, args.length > 0 ? `(${args.length} args)` : '');
+      });
+    }
   });
 
   // Handle server errors
   io.engine.on('connection_error', (err) => {
-    console.log('🔌 Connection error:', err.req, err.code, err.message, err.context);
+    queueLog('🔌 Connection error:', err.req, err.code, err.message, err.context);
   });
 }
 
 // Show status
 function showStatus() {
-  console.log(`\n📊 Bridge Server Status:`);
-  console.log(`   Connected clients: ${clients.size}`);
-  console.log(`   Server port: ${currentPort}`);
-  console.log(`   CORS origin: http://localhost:3000`);
-  console.log(`   Mode: MCP Command Bridge`);
-  console.log(`   Function: Forwards MCP commands to webapp\n`);
+  console.log(`
+📊 Bridge Server Status:
+   Connected clients: ${getConnectedCount()}
+   Server port: ${currentPort}
+   CORS origin: http://localhost:3000
+   Mode: MCP Command Bridge
+   Function: Forwards MCP commands to webapp
+`);
 }
 
 // Handle process termination
-process.on('SIGINT', () => {
+function shutdown() {
+  flushLog();
   console.log('\n👋 Shutting down bridge server...');
   if (io) {
     io.close();
   }
   process.exit(0);
-});
+}
 
-process.on('SIGTERM', () => {
-  console.log('\n👋 Shutting down bridge server...');
-  if (io) {
-    io.close();
-  }
-  process.exit(0);
-});
+process.on('SIGINT', shutdown);
+process.on('SIGTERM', shutdown);
 
 // Start the server
 startServer();
@@ -212,9 +246,10 @@ startServer();
 // Show initial status
 setTimeout(() => {
   showStatus();
-  console.log('💡 Instructions:');
-  console.log('   1. Start your p5.js editor at http://localhost:3000');
-  console.log('   2. Enable MCP in the editor');
-  console.log('   3. Use Claude Desktop with MCP tools');
-  console.log('   4. Commands will be automatically bridged!\n');
+  console.log(`💡 Instructions:
+   1. Start your p5.js editor at http://localhost:3000
+   2. Enable MCP in the editor
+   3. Use Claude Desktop with MCP tools
+   4. Commands will be automatically bridged!${DEBUG ? '' : '\n   (Set BRIDGE_DEBUG=1 to log every forwarded command)'}
+`);
 }, 1000); 
\ No newline at end of file